@@ -9,17 +9,20 @@ PPD-aware: reads paper sizes, margins, resolution, and duplex from the
 printer's PPD file at runtime.
 """
 
-import argparse
-import json as json_mod
+import functools
+import io
+import operator
 import os
 import re
 import subprocess
 import sys
-import tempfile
+from json import dumps as _json_dumps
 from pathlib import Path
 
-sys.stdout.reconfigure(line_buffering=True)
-sys.stderr.reconfigure(line_buffering=True)
+try:
+    import orjson  # optional, faster --json output
+except ImportError:
+    orjson = None
 
 
 def _get_pil():
@@ -32,6 +35,26 @@ def _get_pil():
         sys.exit(1)
 
 
+_PRINTER_NAME_RE = re.compile(r'^[\w.\-]+\Z')
+_JOB_ID_RE = re.compile(r'request id is (\S+)')
+# *Keyword[ Option[/Translation]]: "quoted value" | value
+_PPD_LINE_RE = re.compile(r'^\*(\w+)(?:\s+([^:]+?))?:\s*(?:"([^"]*)"|(.*?))\s*$')
+_RESOLUTION_RE = re.compile(r'(\d+)(?:x(\d+))?\s*dpi', re.IGNORECASE)
+_MEDIABOX_RE = re.compile(
+    rb'/MediaBox\s*\[\s*([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s*\]'
+)
+
+
+def _print_json(obj):
+    """Write obj to stdout as indented UTF-8 JSON (via orjson if installed)."""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = _json_dumps(obj, indent=2, ensure_ascii=False).encode()
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data + b"\n")
+
+
 IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp'}
 PRINTABLE_EXTENSIONS = IMAGE_EXTENSIONS | {'.pdf'}
 
@@ -41,13 +64,16 @@ def is_image(file_path):
     return file_path.suffix.lower() in IMAGE_EXTENSIONS
 
 
-def _resolve_allowed_roots() -> list[Path]:
-    """Build the list of directories from which printing is allowed.
+@functools.lru_cache(maxsize=1)
+def _resolve_allowed_roots() -> tuple[str, ...]:
+    """Build the directories from which printing is allowed (once per process).
 
     Allowed roots (in order):
       1. OPENCLAW_WORKSPACE env var
       2. CWD (if it contains a skills/ directory — likely a workspace)
       3. /tmp
+
+    Returned as strings, ready for ``os.path.commonpath`` comparisons.
     """
     roots: list[Path] = []
 
@@ -60,7 +86,7 @@ def _resolve_allowed_roots() -> list[Path]:
         roots.append(cwd)
 
     roots.append(Path("/tmp").resolve())
-    return roots
+    return tuple(str(root) for root in roots)
 
 
 def _validate_file_path(file_path: Path) -> Path:
@@ -82,8 +108,9 @@ def _validate_file_path(file_path: Path) -> Path:
         raise ValueError(f"Not a regular file: {file_path}")
 
     # The resolved (real) path must be inside an allowed root
+    resolved_str = str(resolved)
     allowed = _resolve_allowed_roots()
-    if not any(resolved == root or resolved.is_relative_to(root) for root in allowed):
+    if not any(os.path.commonpath((resolved_str, root)) == root for root in allowed):
         raise ValueError(
             f"File is outside the allowed directories "
             f"(workspace, /tmp): {resolved}"
@@ -104,13 +131,14 @@ def _validate_printer_name(name: str) -> str:
 
     CUPS printer names contain only alphanumeric, hyphen, underscore, and period.
     """
-    if not re.match(r'^[\w.\-]+$', name):
+    if not _PRINTER_NAME_RE.match(name):
         raise ValueError(f"Invalid printer name: {name!r}")
     return name
 
 
+@functools.lru_cache(maxsize=1)
 def get_default_printer():
-    """Get the system default printer name."""
+    """Get the system default printer name (looked up once per process)."""
     result = subprocess.run(['lpstat', '-d'], capture_output=True, text=True)
     if result.returncode == 0:
         for line in result.stdout.splitlines():
@@ -119,6 +147,110 @@ def get_default_printer():
     return None
 
 
+PPD_DIRS = ('/etc/cups/ppd', '/private/etc/cups/ppd')
+_PPD_CACHE: dict[str, tuple[float, dict]] = {}
+
+
+def _parse_ppd(ppd):
+    """Parse PPD text in a single pass.
+
+    Returns dict with:
+      values: {keyword: value} for main-keyword lines like ``*ModelName: "..."``
+      papers: {name: (w, h, (x1, y1, x2, y2) or None)} in points, joining
+        PaperDimension with ImageableArea
+      slots: list of InputSlot names
+    """
+    values = {}
+    papers = {}  # name -> [dims, area], either may appear first
+    slots = []
+
+    def paper_dimension(option, value):
+        dims = value.split()
+        if len(dims) == 2:
+            papers.setdefault(option, [None, None])[0] = (float(dims[0]), float(dims[1]))
+
+    def imageable_area(option, value):
+        dims = value.split()
+        if len(dims) == 4:
+            papers.setdefault(option, [None, None])[1] = tuple(float(d) for d in dims)
+
+    def input_slot(option, value):
+        slots.append(option)
+
+    handlers = {
+        "PaperDimension": paper_dimension,
+        "ImageableArea": imageable_area,
+        "InputSlot": input_slot,
+    }
+
+    for line in ppd.splitlines():
+        m = _PPD_LINE_RE.match(line)
+        if not m:
+            continue
+        key, option, quoted, unquoted = m.groups()
+        value = quoted if quoted is not None else unquoted
+        if option is None:
+            # First occurrence wins, like a top-down lookup
+            values.setdefault(key, value.strip('"'))
+            continue
+        handler = handlers.get(key)
+        if handler:
+            # Drop the "/Translation" part of "Option/Translation"
+            handler(option.split("/", 1)[0].strip(), value)
+    papers = {name: (*dims, area) for name, (dims, area) in papers.items() if dims}
+    return {'values': values, 'papers': papers, 'slots': slots}
+
+
+def _read_ppd(path):
+    """Read a PPD file as text, or return None if it does not exist."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8', 'replace')
+    except FileNotFoundError:
+        return None
+
+
+def available_ppds():
+    """Yield paths of installed printer PPD files.
+
+    Streams entries via ``os.scandir`` so no directory listing is built and
+    the file-type check comes from the directory entry, not an extra stat.
+    """
+    for ppd_dir in PPD_DIRS:
+        try:
+            it = os.scandir(ppd_dir)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.endswith('.ppd') and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+
+def _load_ppd(safe_name):
+    """Find, read and parse a printer's PPD file.
+
+    Memoized by (path, mtime), so a repeated lookup costs a single stat.
+    Returns None if the printer has no PPD file.
+    """
+    for ppd_dir in PPD_DIRS:
+        path = f"{ppd_dir}/{safe_name}.ppd"
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        cached = _PPD_CACHE.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        ppd = _read_ppd(path)
+        if ppd is None:
+            continue
+        parsed = _parse_ppd(ppd)
+        _PPD_CACHE[path] = (mtime, parsed)
+        return parsed
+    return None
+
+
 def get_printer_specs(printer):
     """Get paper size, imageable area, and resolution from PPD file.
 
@@ -136,88 +268,90 @@ def get_printer_specs(printer):
     }
 
     safe_name = _validate_printer_name(printer)
-    ppd_path = Path(f"/etc/cups/ppd/{safe_name}.ppd")
-    if not ppd_path.exists():
-        ppd_path = Path(f"/private/etc/cups/ppd/{safe_name}.ppd")
-    if not ppd_path.exists():
+    parsed = _load_ppd(safe_name)
+    if parsed is None:
         return specs
 
-    ppd = ppd_path.read_text()
-
-    def ppd_val(key):
-        for line in ppd.splitlines():
-            if line.startswith(f"*{key}:"):
-                return line.split(":", 1)[1].strip().strip('"')
-        return None
+    values = parsed['values']
 
     # Default media
-    media = ppd_val("DefaultPageSize") or "A4"
+    media = values.get("DefaultPageSize") or "A4"
     specs['media'] = media
 
     # Resolution
-    res_str = ppd_val("DefaultResolution") or "300x300dpi"
+    res_str = values.get("DefaultResolution") or "300x300dpi"
     try:
         specs['dpi'] = int(res_str.split("x")[0])
     except ValueError:
         specs['dpi'] = 300
 
     # Duplex
-    duplex = ppd_val("DefaultDuplex")
+    duplex = values.get("DefaultDuplex")
     specs['duplex'] = duplex if duplex and duplex != "None" else None
 
     # Paper dimensions for default media
-    for line in ppd.splitlines():
-        if line.startswith(f"*PaperDimension {media}:"):
-            dims = line.split('"')[1].split()
-            if len(dims) == 2:
-                specs['page_w'] = float(dims[0])
-                specs['page_h'] = float(dims[1])
-        elif line.startswith(f"*ImageableArea {media}:"):
-            dims = line.split('"')[1].split()
-            if len(dims) == 4:
-                specs['img_x1'] = float(dims[0])
-                specs['img_y1'] = float(dims[1])
-                specs['img_x2'] = float(dims[2])
-                specs['img_y2'] = float(dims[3])
+    paper = parsed['papers'].get(media)
+    if paper:
+        specs['page_w'], specs['page_h'], area = paper
+        if area:
+            specs['img_x1'], specs['img_y1'], specs['img_x2'], specs['img_y2'] = area
 
     return specs
 
 
+def _write_image_pdf(fp, jpeg_data, px_size, page_size, rect):
+    """Write a single-page PDF showing a JPEG image on an otherwise blank page.
+
+    Args:
+        px_size: (width, height) of the JPEG in pixels.
+        page_size: (width, height) of the page in points.
+        rect: (x, y, width, height) of the image on the page in points,
+            origin at the bottom-left corner.
+    """
+    px_w, px_h = px_size
+    page_w, page_h = page_size
+    x, y, w, h = rect
+    content = f"q {w:.4f} 0 0 {h:.4f} {x:.4f} {y:.4f} cm /Im0 Do Q\n".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_w:.2f} {page_h:.2f}] "
+         f"/Resources << /XObject << /Im0 4 0 R >> >> /Contents 5 0 R >>").encode(),
+        (f"<< /Type /XObject /Subtype /Image /Width {px_w} /Height {px_h} "
+         f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode "
+         f"/Length {len(jpeg_data)} >>\nstream\n").encode() + jpeg_data + b"\nendstream",
+        f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"endstream",
+    ]
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref_pos = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref_pos}\n%%EOF\n").encode()
+    fp.write(out)
+
+
 def convert_image_to_pdf(image_path, specs):
     """Convert image to PDF sized for the target printer's current media.
 
     Uses the printer's PPD specs for page size, imageable area, and resolution.
     """
+    import tempfile
+
     Image = _get_pil()
     img = Image.open(image_path)
 
-    # Convert to RGB if needed (for PNG with transparency, etc.)
-    if img.mode in ('RGBA', 'LA', 'P'):
-        rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-        if img.mode == 'P':
-            img = img.convert('RGBA')
-        rgb_img.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-        img = rgb_img
-    elif img.mode != 'RGB':
-        img = img.convert('RGB')
-
-    # Create temporary PDF
-    temp_pdf = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-    temp_pdf.close()
-
     dpi = specs['dpi']
 
-    # Full page size in pixels at printer DPI
-    page_w_px = int(specs['page_w'] / 72.0 * dpi)
-    page_h_px = int(specs['page_h'] / 72.0 * dpi)
-
     # Imageable (printable) area in pixels
-    img_x1 = int(specs['img_x1'] / 72.0 * dpi)
-    img_y1 = int(specs['img_y1'] / 72.0 * dpi)
-    img_x2 = int(specs['img_x2'] / 72.0 * dpi)
-    img_y2 = int(specs['img_y2'] / 72.0 * dpi)
-    printable_w = img_x2 - img_x1
-    printable_h = img_y2 - img_y1
+    printable_w = int((specs['img_x2'] - specs['img_x1']) / 72.0 * dpi)
+    printable_h = int((specs['img_y2'] - specs['img_y1']) / 72.0 * dpi)
 
     # Scale image to fit within printable area, preserving aspect ratio
     img_aspect = img.width / img.height
@@ -230,23 +364,50 @@ def convert_image_to_pdf(image_path, specs):
         new_height = printable_h
         new_width = int(printable_h * img_aspect)
 
-    # Resize image at full printer resolution
-    img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    # Let JPEG decode at a reduced scale (1/2, 1/4, 1/8) when the source is
+    # much larger than the target; no-op for other formats
+    img.draft('RGB', (new_width, new_height))
 
-    # Create full page canvas and center image within printable area
-    canvas = Image.new('RGB', (page_w_px, page_h_px), (255, 255, 255))
-    x_offset = img_x1 + (printable_w - new_width) // 2
-    y_offset = img_y1 + (printable_h - new_height) // 2
-    canvas.paste(img_resized, (x_offset, y_offset))
+    # Convert to RGB if needed (for PNG with transparency, etc.)
+    if img.mode == 'P':
+        img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+    if img.mode in ('RGBA', 'LA'):
+        if img.getchannel('A').getextrema()[0] == 255:
+            # Fully opaque: nothing to composite
+            img = img.convert('RGB')
+        else:
+            white = Image.new('RGBA', img.size, (255, 255, 255, 255))
+            img = Image.alpha_composite(white, img.convert('RGBA')).convert('RGB')
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
 
-    # Save as PDF at printer DPI
-    canvas.save(temp_pdf.name, "PDF", resolution=float(dpi))
+    # Resize image at full printer resolution; for large downscales,
+    # reducing_gap does a cheap integer box reduction before LANCZOS
+    img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    # Center image within printable area (PDF origin is bottom-left)
+    w_pt = new_width * 72.0 / dpi
+    h_pt = new_height * 72.0 / dpi
+    x_pt = specs['img_x1'] + (specs['img_x2'] - specs['img_x1'] - w_pt) / 2
+    y_pt = specs['img_y1'] + (specs['img_y2'] - specs['img_y1'] - h_pt) / 2
+
+    # Encode only the image and place it on a blank page, instead of
+    # compositing it onto a full-page white canvas
+    jpeg = io.BytesIO()
+    img_resized.save(jpeg, "JPEG")
+
+    # Write straight into the temporary file's open handle (no re-open by name)
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_pdf:
+        _write_image_pdf(
+            temp_pdf, jpeg.getvalue(), img_resized.size,
+            (specs['page_w'], specs['page_h']), (x_pt, y_pt, w_pt, h_pt),
+        )
 
     media = specs['media']
     pt_to_mm = 25.4 / 72.0
     w_mm = specs['page_w'] * pt_to_mm
     h_mm = specs['page_h'] * pt_to_mm
-    print(f"[print] Generated PDF: {media} ({w_mm:.0f}×{h_mm:.0f}mm) at {dpi} DPI", file=sys.stderr)
+    print(f"[print] Generated PDF: {media} ({w_mm:.0f}×{h_mm:.0f}mm) at {dpi} DPI", file=sys.stderr, flush=True)
 
     return temp_pdf.name
 
@@ -260,10 +421,7 @@ def _detect_pdf_orientation(pdf_path):
     try:
         data = Path(pdf_path).read_bytes()[:8192]  # first 8KB is enough
         # Match /MediaBox [x1 y1 x2 y2]  (ints or floats)
-        m = re.search(
-            rb'/MediaBox\s*\[\s*([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s*\]',
-            data,
-        )
+        m = _MEDIABOX_RE.search(data)
         if m:
             x1, y1, x2, y2 = (float(v) for v in m.groups())
             w, h = x2 - x1, y2 - y1
@@ -273,12 +431,14 @@ def _detect_pdf_orientation(pdf_path):
     return None
 
 
-def print_file(file_path, printer=None, extra_options=None):
-    """Print file to printer using lp command.
+def print_file(file_paths, printer=None, extra_options=None, specs=None):
+    """Print one or more files as a single job using one lp command.
 
     Args:
+        file_paths: List of files to print, in order.
         extra_options: List of CUPS option strings like
             ``["InputSlot=tray-1", "cupsPrintQuality=High"]``.
+        specs: Printer specs from ``get_printer_specs``; looked up if omitted.
 
     Returns (success: bool, job_id: str or None).
     """
@@ -288,22 +448,22 @@ def print_file(file_path, printer=None, extra_options=None):
             print("Error: No default printer set. Use --printer to specify one.", file=sys.stderr)
             return False, None
 
-    specs = get_printer_specs(printer)
+    specs = specs or get_printer_specs(printer)
 
     cmd = [
         'lp',
         '-d', printer,
-        str(file_path),
+        *map(str, file_paths),
         '-o', f'media={specs["media"]}',
         '-o', 'fit-to-page',
     ]
 
     # Add duplex if the printer supports it
-    # Detect document orientation for correct binding:
+    # Detect document orientation (of the first file) for correct binding:
     #   portrait  → long-edge  (book-style flip left/right)
     #   landscape → short-edge (book-style flip left/right)
     if specs['duplex']:
-        orientation = _detect_pdf_orientation(file_path)
+        orientation = _detect_pdf_orientation(file_paths[0])
         if orientation == 'landscape':
             cmd.extend(['-o', 'sides=two-sided-short-edge'])
         else:
@@ -320,7 +480,7 @@ def print_file(file_path, printer=None, extra_options=None):
         output = result.stdout.strip()
         # Parse job ID from lp output like "request id is HP_...-123 (1 file(s))"
         job_id = None
-        m = re.search(r'request id is (\S+)', output)
+        m = _JOB_ID_RE.search(output)
         if m:
             job_id = m.group(1)
         return True, job_id
@@ -336,37 +496,38 @@ def print_file(file_path, printer=None, extra_options=None):
 
 def cmd_list(args):
     """List available printers."""
-    result = subprocess.run(['lpstat', '-p', '-d'], capture_output=True, text=True)
-    if result.returncode != 0:
+    # Parse default printer and printer entries as lines arrive
+    default = None
+    entries = []
+    with subprocess.Popen(['lpstat', '-p', '-d'], stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, text=True, bufsize=1) as proc:
+        for line in proc.stdout:
+            if line.startswith("system default destination:"):
+                default = line.split(":", 1)[1].strip()
+            elif line.startswith("printer "):
+                parts = line.split()
+                name = parts[1]
+                # e.g. "printer X is idle.  enabled since ..."
+                tokens = {t.rstrip(".") for t in parts[2:]}
+                status = "idle" if "idle" in tokens else "busy" if "printing" in tokens else "unknown"
+                entries.append((name, status, "enabled" in tokens))
+
+    if proc.returncode != 0:
         if args.json:
-            print(json_mod.dumps({"error": "Could not list printers"}))
+            print(_json_dumps({"error": "Could not list printers"}))
         else:
             print("Error: Could not list printers", file=sys.stderr)
         return 1
 
-    # Parse default printer
-    default = None
-    for line in result.stdout.splitlines():
-        if line.startswith("system default destination:"):
-            default = line.split(":", 1)[1].strip()
-
-    # Parse printer entries
-    printers = []
-    for line in result.stdout.splitlines():
-        if line.startswith("printer "):
-            parts = line.split()
-            name = parts[1]
-            status = "idle" if "idle" in line else "busy" if "printing" in line else "unknown"
-            enabled = "enabled" in line
-            printers.append({
-                "name": name,
-                "status": status,
-                "enabled": enabled,
-                "default": name == default,
-            })
+    ppd_names = {os.path.basename(path)[:-4] for path in available_ppds()}
+    printers = [
+        {"name": name, "status": status, "enabled": enabled, "default": name == default,
+         "has_ppd": name in ppd_names}
+        for name, status, enabled in entries
+    ]
 
     if args.json:
-        print(json_mod.dumps(printers, indent=2))
+        _print_json(printers)
     else:
         if not printers:
             print("No printers found.")
@@ -385,7 +546,7 @@ def cmd_info(args):
     if not printer:
         msg = "No default printer set. Use --printer to specify one."
         if args.json:
-            print(json_mod.dumps({"error": msg}))
+            print(_json_dumps({"error": msg}))
         else:
             print(f"Error: {msg}", file=sys.stderr)
         return 1
@@ -396,31 +557,25 @@ def cmd_info(args):
     except ValueError as e:
         msg = str(e)
         if args.json:
-            print(json_mod.dumps({"error": msg}))
+            print(_json_dumps({"error": msg}))
         else:
             print(f"Error: {msg}", file=sys.stderr)
         return 1
 
-    ppd_path = Path(f"/etc/cups/ppd/{safe_name}.ppd")
-    if not ppd_path.exists():
-        ppd_path = Path(f"/private/etc/cups/ppd/{safe_name}.ppd")
-    if not ppd_path.exists():
+    parsed = _load_ppd(safe_name)
+    if parsed is None:
         msg = f"No PPD file found for {printer}"
         if args.json:
-            print(json_mod.dumps({"error": msg}))
+            print(_json_dumps({"error": msg}))
         else:
             print(f"Error: {msg}", file=sys.stderr)
         return 1
 
-    ppd = ppd_path.read_text()
+    values = parsed['values']
+    papers = parsed['papers']
+    slots = parsed['slots']
     pt_to_mm = 25.4 / 72.0
 
-    def ppd_val(key):
-        for line in ppd.splitlines():
-            if line.startswith(f"*{key}:"):
-                return line.split(":", 1)[1].strip().strip('"')
-        return None
-
     # General info
     info = {"printer": printer}
     field_map = [
@@ -432,15 +587,14 @@ def cmd_info(args):
         ("DefaultDuplex", "default_duplex"),
     ]
     for ppd_key, json_key in field_map:
-        val = ppd_val(ppd_key)
+        val = values.get(ppd_key)
         if val:
             info[json_key] = val
 
     # Parse resolution into structured object
-    res_str = ppd_val("DefaultResolution")
+    res_str = values.get("DefaultResolution")
     if res_str:
-        import re as _re
-        m = _re.match(r"(\d+)(?:x(\d+))?\s*dpi", res_str, _re.IGNORECASE)
+        m = _RESOLUTION_RE.match(res_str)
         if m:
             x_dpi = int(m.group(1))
             y_dpi = int(m.group(2)) if m.group(2) else x_dpi
@@ -448,42 +602,21 @@ def cmd_info(args):
         else:
             info["resolution"] = res_str  # fallback to raw string
 
-    # Parse paper sizes with margins
-    paper_dims = {}
-    imageable = {}
-    for line in ppd.splitlines():
-        if line.startswith("*PaperDimension "):
-            name = line.split()[1].rstrip(":")
-            dims = line.split('"')[1].split()
-            if len(dims) == 2:
-                paper_dims[name] = (float(dims[0]), float(dims[1]))
-        elif line.startswith("*ImageableArea "):
-            name = line.split()[1].rstrip(":")
-            dims = line.split('"')[1].split()
-            if len(dims) == 4:
-                imageable[name] = tuple(float(d) for d in dims)
-
-    # Parse input slots
-    slots = []
-    for line in ppd.splitlines():
-        if line.startswith("*InputSlot "):
-            slots.append(line.split()[1].rstrip(":"))
     if slots:
         info["trays"] = slots
 
     # Paper sizes
-    default_paper = ppd_val("DefaultPageSize")
+    default_paper = values.get("DefaultPageSize")
     paper_list = []
-    for name in sorted(paper_dims.keys()):
-        w, h = paper_dims[name]
+    for name, (w, h, area) in sorted(papers.items(), key=operator.itemgetter(0)):
         entry = {
             "name": name,
             "width_mm": round(w * pt_to_mm, 1),
             "height_mm": round(h * pt_to_mm, 1),
             "default": name == default_paper,
         }
-        if name in imageable:
-            x1, y1, x2, y2 = imageable[name]
+        if area:
+            x1, y1, x2, y2 = area
             entry["margins_mm"] = {
                 "left": round(x1 * pt_to_mm, 1),
                 "bottom": round(y1 * pt_to_mm, 1),
@@ -494,7 +627,7 @@ def cmd_info(args):
     info["paper_sizes"] = paper_list
 
     if args.json:
-        print(json_mod.dumps(info, indent=2))
+        _print_json(info)
     else:
         print(f"Printer: {printer}\n")
 
@@ -543,7 +676,7 @@ def cmd_options(args):
     if not printer:
         msg = "No default printer set. Use --printer to specify one."
         if args.json:
-            print(json_mod.dumps({"error": msg}))
+            print(_json_dumps({"error": msg}))
         else:
             print(f"Error: {msg}", file=sys.stderr)
         return 1
@@ -553,45 +686,46 @@ def cmd_options(args):
     except ValueError as e:
         msg = str(e)
         if args.json:
-            print(json_mod.dumps({"error": msg}))
+            print(_json_dumps({"error": msg}))
         else:
             print(f"Error: {msg}", file=sys.stderr)
         return 1
 
-    result = subprocess.run(['lpoptions', '-p', printer, '-l'], capture_output=True, text=True)
-    if result.returncode != 0:
+    options = []
+    with subprocess.Popen(['lpoptions', '-p', printer, '-l'], stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, text=True, bufsize=1) as proc:
+        for line in proc.stdout:
+            if '/' in line and ':' in line:
+                key_label, _, values_str = line.partition(':')
+                option, _, label = key_label.partition('/')
+                values = values_str.strip().split()
+
+                current = None
+                all_values = []
+                for v in values:
+                    if v.startswith('*'):
+                        current = v[1:]
+                        all_values.append(current)
+                    else:
+                        all_values.append(v)
+
+                options.append({
+                    "option": option.strip(),
+                    "label": label.strip(),
+                    "current": current,
+                    "values": all_values,
+                })
+
+    if proc.returncode != 0:
         msg = f"Could not get options for {printer}"
         if args.json:
-            print(json_mod.dumps({"error": msg}))
+            print(_json_dumps({"error": msg}))
         else:
             print(f"Error: {msg}", file=sys.stderr)
         return 1
 
-    options = []
-    for line in result.stdout.splitlines():
-        if '/' in line and ':' in line:
-            key_label, _, values_str = line.partition(':')
-            option, _, label = key_label.partition('/')
-            values = values_str.strip().split()
-
-            current = None
-            all_values = []
-            for v in values:
-                if v.startswith('*'):
-                    current = v[1:]
-                    all_values.append(current)
-                else:
-                    all_values.append(v)
-
-            options.append({
-                "option": option.strip(),
-                "label": label.strip(),
-                "current": current,
-                "values": all_values,
-            })
-
     if args.json:
-        print(json_mod.dumps(options, indent=2))
+        _print_json(options)
     else:
         print(f"Options for {printer}:\n")
         for opt in options:
@@ -604,22 +738,24 @@ def cmd_options(args):
 
 
 def cmd_print(args):
-    """Print a file."""
-    try:
-        file_path = _validate_file_path(args.file)
-    except ValueError as e:
-        msg = str(e)
-        if args.json:
-            print(json_mod.dumps({"ok": False, "error": msg}))
-        else:
-            print(f"Error: {msg}", file=sys.stderr)
-        return 1
+    """Print one or more files as a single job."""
+    file_paths = []
+    for file_arg in args.file:
+        try:
+            file_paths.append(_validate_file_path(file_arg))
+        except ValueError as e:
+            msg = str(e)
+            if args.json:
+                print(_json_dumps({"ok": False, "error": msg}))
+            else:
+                print(f"Error: {msg}", file=sys.stderr)
+            return 1
 
     printer = args.printer or get_default_printer()
     if not printer:
         msg = "No default printer set. Use --printer to specify one."
         if args.json:
-            print(json_mod.dumps({"ok": False, "error": msg}))
+            print(_json_dumps({"ok": False, "error": msg}))
         else:
             print(f"Error: {msg}", file=sys.stderr)
         return 1
@@ -629,45 +765,53 @@ def cmd_print(args):
     except ValueError as e:
         msg = str(e)
         if args.json:
-            print(json_mod.dumps({"ok": False, "error": msg}))
+            print(_json_dumps({"ok": False, "error": msg}))
         else:
             print(f"Error: {msg}", file=sys.stderr)
         return 1
 
-    file_to_print = file_path
-    temp_pdf = None
-
-    # Handle images by converting to PDF first
-    if is_image(file_path):
-        if not args.json:
-            print("[print] Converting image to PDF...", file=sys.stderr)
-        try:
-            specs = get_printer_specs(printer)
-            temp_pdf = convert_image_to_pdf(file_path, specs)
-            file_to_print = Path(temp_pdf)
-        except Exception as e:
-            msg = f"Error converting image: {e}"
-            if args.json:
-                print(json_mod.dumps({"ok": False, "error": msg}))
-            else:
-                print(msg, file=sys.stderr)
-            return 1
+    specs = get_printer_specs(printer)
+    files_to_print = []
+    temp_pdfs = []
 
-    success, job_id = print_file(file_to_print, printer, extra_options=args.option)
+    try:
+        # Handle images by converting to PDF first
+        for file_path in file_paths:
+            if not is_image(file_path):
+                files_to_print.append(file_path)
+                continue
+            if not args.json:
+                print("[print] Converting image to PDF...", file=sys.stderr, flush=True)
+            try:
+                temp_pdf = convert_image_to_pdf(file_path, specs)
+            except Exception as e:
+                msg = f"Error converting image: {e}"
+                if args.json:
+                    print(_json_dumps({"ok": False, "error": msg}))
+                else:
+                    print(msg, file=sys.stderr)
+                return 1
+            temp_pdfs.append(temp_pdf)
+            files_to_print.append(Path(temp_pdf))
 
-    # Clean up temp file
-    if temp_pdf:
-        Path(temp_pdf).unlink(missing_ok=True)
+        success, job_id = print_file(files_to_print, printer, extra_options=args.option, specs=specs)
+    finally:
+        # Clean up temp files
+        for temp_pdf in temp_pdfs:
+            Path(temp_pdf).unlink(missing_ok=True)
 
     if args.json:
         result = {
             "ok": success,
             "printer": printer,
-            "file": str(file_path),
         }
+        if len(file_paths) == 1:
+            result["file"] = str(file_paths[0])
+        else:
+            result["files"] = [str(f) for f in file_paths]
         if job_id:
             result["job_id"] = job_id
-        print(json_mod.dumps(result, indent=2))
+        _print_json(result)
     else:
         if success:
             id_str = f" (job {job_id})" if job_id else ""
@@ -682,6 +826,8 @@ def cmd_print(args):
 
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='Print images and PDFs to any CUPS printer'
     )
@@ -705,8 +851,8 @@ def main():
     sub_options.set_defaults(func=cmd_options)
 
     # print
-    sub_print = subparsers.add_parser('print', help='Print a file (PDF or image)')
-    sub_print.add_argument('file', type=Path, help='File to print')
+    sub_print = subparsers.add_parser('print', help='Print files (PDF or image) as one job')
+    sub_print.add_argument('file', type=Path, nargs='+', help='File(s) to print')
     sub_print.add_argument('--printer', default=None, help='Printer name (default: system default)')
     sub_print.add_argument('-o', '--option', action='append', metavar='KEY=VALUE',
                            help='CUPS option (repeatable, e.g. -o InputSlot=tray-1)')
@@ -719,7 +865,9 @@ def main():
         parser.print_help()
         return 1
 
-    return args.func(args)
+    rc = args.func(args)
+    sys.stdout.flush()
+    return rc
 
 
 if __name__ == '__main__':